@@ -1,4 +1,5 @@
 import typer
+from .journal import Journal
 from .superset_api import Superset
 from .push_physical_datasets import main as physicals
 from .push_virtual_datasets import main as virtuals
@@ -24,7 +25,18 @@ def push_virtual_datasets(datasets_dir: str = typer.Option('.', help="Directory
                       superset_user: str = typer.Option(None, envvar="SUPERSET_USER",
                                                                 help="Superset Username"),
                       superset_password: str = typer.Option(None, envvar="SUPERSET_PASSWORD",
-                                                                 help="Password of the Superset user.")):
+                                                                 help="Password of the Superset user."),
+                      superset_gzip_requests: bool = typer.Option(False, envvar="SUPERSET_GZIP_REQUESTS",
+                                                                  help="Whether request bodies should be sent "
+                                                                       "gzip-compressed. Superset (or a proxy in "
+                                                                       "front of it) has to accept them."),
+                      journal_file: str = typer.Option(None, help="A path to a journal file recording the progress "
+                                                                  "of the push. Defaults to "
+                                                                  "'.push-virtual-datasets.journal.jsonl' with --resume, "
+                                                                  "otherwise no journal is kept."),
+                      resume: bool = typer.Option(False, help="Whether to resume an interrupted push, skipping "
+                                                              "datasets already pushed with the same inputs "
+                                                              "according to the journal file.")):
      # require at least one token for Superset or a username/password combination
      assert superset_access_token is not None or superset_refresh_token is not None or (superset_user is not None and superset_password is not None), \
            "Add `SUPERSET_ACCESS_TOKEN or SUPERSET_REFRESH_TOKEN " \
@@ -37,9 +49,14 @@ def push_virtual_datasets(datasets_dir: str = typer.Option('.', help="Directory
                         access_token = superset_access_token,
                         refresh_token = superset_refresh_token,
                         user = superset_user,
-                        password = superset_password)
+                        password = superset_password,
+                        gzip_requests = superset_gzip_requests)
 
-     virtuals(datasets_dir, superset_db_id, superset_refresh_columns, superset)
+     if resume and journal_file is None:
+          journal_file = '.push-virtual-datasets.journal.jsonl'
+
+     with Journal(journal_file, resume) as journal:
+          virtuals(datasets_dir, superset_db_id, superset_refresh_columns, superset, journal)
 
 
 @app.command()
@@ -65,7 +82,18 @@ def push_physical_datasets(dbt_project_dir: str = typer.Option('.', help="Direct
                       superset_user: str = typer.Option(None, envvar="SUPERSET_USER",
                                                                 help="Superset Username"),
                       superset_password: str = typer.Option(None, envvar="SUPERSET_PASSWORD",
-                                                                 help="Password of the Superset user.")):
+                                                                 help="Password of the Superset user."),
+                      superset_gzip_requests: bool = typer.Option(False, envvar="SUPERSET_GZIP_REQUESTS",
+                                                                  help="Whether request bodies should be sent "
+                                                                       "gzip-compressed. Superset (or a proxy in "
+                                                                       "front of it) has to accept them."),
+                      journal_file: str = typer.Option(None, help="A path to a journal file recording the progress "
+                                                                  "of the push. Defaults to "
+                                                                  "'.push-physical-datasets.journal.jsonl' with --resume, "
+                                                                  "otherwise no journal is kept."),
+                      resume: bool = typer.Option(False, help="Whether to resume an interrupted push, skipping "
+                                                              "datasets already pushed with the same inputs "
+                                                              "according to the journal file.")):
      # require at least one token for Superset or a username/password combination
      assert superset_access_token is not None or superset_refresh_token is not None or (superset_user is not None and superset_password is not None), \
            "Add `SUPERSET_ACCESS_TOKEN or SUPERSET_REFRESH_TOKEN " \
@@ -78,9 +106,15 @@ def push_physical_datasets(dbt_project_dir: str = typer.Option('.', help="Direct
                         access_token = superset_access_token,
                         refresh_token = superset_refresh_token,
                         user = superset_user,
-                        password = superset_password)
+                        password = superset_password,
+                        gzip_requests = superset_gzip_requests)
+
+     if resume and journal_file is None:
+          journal_file = '.push-physical-datasets.journal.jsonl'
 
-     physicals(dbt_project_dir, dbt_db_name, superset_db_id, superset_debug_dir, superset_refresh_columns, superset)
+     with Journal(journal_file, resume) as journal:
+          physicals(dbt_project_dir, dbt_db_name, superset_db_id, superset_debug_dir, superset_refresh_columns,
+                    superset, journal)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,81 @@
+from types import MappingProxyType
+
+
+class DatasetRecord:
+    """A Superset dataset as listed by ``Superset.get_datasets``."""
+
+    __slots__ = ('dataset_id', 'kind', 'schema', 'table_name')
+
+    def __init__(self, dataset_id, kind, schema, table_name):
+        self.dataset_id = dataset_id
+        self.kind = kind
+        self.schema = schema
+        self.table_name = table_name
+
+    @property
+    def key(self):
+        return f'{self.schema}.{self.table_name}'
+
+    def __repr__(self):
+        return f'DatasetRecord({self.dataset_id!r}, {self.kind!r}, {self.schema!r}, {self.table_name!r})'
+
+
+class DatasetIndex:
+    """An in-memory index of Superset datasets.
+
+    Datasets can be looked up by id, by ``schema.table_name`` key and by kind (``physical``
+    or ``virtual``) in constant time. Lookups by kind return read-only views rather than copies.
+    Iterating over the index or testing membership works with ``schema.table_name`` keys,
+    like with the dictionary previously returned by ``Superset.get_datasets``.
+    """
+
+    __slots__ = ('_by_id', '_by_key', '_by_kind')
+
+    def __init__(self, records=()):
+        self._by_id = {}
+        self._by_key = {}
+        self._by_kind = {}
+
+        for record in records:
+            self.insert(record)
+
+    def insert(self, record):
+        """Adds ``record`` to the index, replacing any dataset with the same id or key."""
+        self.delete(record.dataset_id)
+        existing = self._by_key.get(record.key)
+        if existing is not None:
+            self.delete(existing.dataset_id)
+
+        self._by_id[record.dataset_id] = record
+        self._by_key[record.key] = record
+        self._by_kind.setdefault(record.kind, {})[record.key] = record
+
+    def delete(self, dataset_id):
+        """Removes the dataset with ``dataset_id`` from the index and returns it, if present."""
+        record = self._by_id.pop(dataset_id, None)
+        if record is not None:
+            del self._by_key[record.key]
+            del self._by_kind[record.kind][record.key]
+        return record
+
+    def get_by_id(self, dataset_id):
+        return self._by_id.get(dataset_id)
+
+    def get_by_schema_table(self, schema, table_name):
+        return self._by_key.get(f'{schema}.{table_name}')
+
+    def by_kind(self, kind):
+        """Returns a read-only view of the datasets of ``kind`` by their ``schema.table_name`` key."""
+        return MappingProxyType(self._by_kind.setdefault(kind, {}))
+
+    def __getitem__(self, key):
+        return self._by_key[key]
+
+    def __contains__(self, key):
+        return key in self._by_key
+
+    def __iter__(self):
+        return iter(self._by_key)
+
+    def __len__(self):
+        return len(self._by_key)
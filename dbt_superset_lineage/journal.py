@@ -0,0 +1,89 @@
+import hashlib
+import json
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+
+def hash_payload(payload):
+    """Returns a stable hash of a JSON-serializable ``payload``, e.g. the dbt inputs of a dataset."""
+    data = json.dumps(payload, sort_keys=True, default=str).encode('utf-8')
+    return hashlib.sha256(data).hexdigest()
+
+
+class Journal:
+    """An append-only journal of the phases completed for each dataset during a push.
+
+    Every completed phase (e.g. ``refreshed``, ``fetched``, ``merged``, ``put``) of a dataset is
+    appended as one JSON line together with the hash of the inputs it was completed with.
+    When resuming, phases already completed with the same inputs can be skipped.
+    Without a file, the journal records nothing and no phase is ever completed.
+    """
+
+    def __init__(self, file_path=None, resume=False):
+        """
+        Args:
+            file_path: Path of the journal file, or None to disable the journal.
+            resume: Whether to load the existing journal and append to it. If False, the journal
+                is started afresh.
+        """
+
+        self.file_path = file_path
+        self.completed = {}
+        self._fp = None
+
+        if file_path is None:
+            return
+
+        if resume:
+            self._load()
+        else:
+            logger.info("Starting a new journal in %s", file_path)
+
+        self._fp = open(file_path, 'a' if resume else 'w')
+
+        # start on a new line in case the previous run was killed while writing an entry
+        if self._fp.tell() > 0:
+            with open(file_path, 'rb') as fp:
+                fp.seek(-1, os.SEEK_END)
+                if fp.read(1) != b'\n':
+                    self._fp.write('\n')
+
+    def _load(self):
+        if not os.path.exists(self.file_path):
+            logger.info("There is no journal to resume from in %s", self.file_path)
+            return
+
+        with open(self.file_path) as fp:
+            for line in fp:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # the last line may be incomplete if the previous run was killed while writing it
+                    logger.warning("Skipping a corrupted journal entry: %s", line.strip())
+                    continue
+                self.completed[(entry['dataset_id'], entry['phase'])] = entry['hash']
+
+        logger.info("Resuming from %d journal entries in %s", len(self.completed), self.file_path)
+
+    def is_completed(self, dataset_id, phase, payload_hash):
+        return self.completed.get((dataset_id, phase)) == payload_hash
+
+    def record(self, dataset_id, phase, payload_hash):
+        if self._fp is None:
+            return
+
+        self.completed[(dataset_id, phase)] = payload_hash
+        self._fp.write(json.dumps({'dataset_id': dataset_id, 'phase': phase, 'hash': payload_hash}) + '\n')
+        self._fp.flush()
+
+    def close(self):
+        if self._fp is not None:
+            self._fp.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
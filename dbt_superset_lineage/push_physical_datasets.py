@@ -6,6 +6,10 @@ import re
 from bs4 import BeautifulSoup
 from markdown import markdown
 
+from .dataset_index import DatasetRecord
+from .journal import Journal, hash_payload
+from .superset_api import dump_json_file, json_loads
+
 
 logging.basicConfig(level=logging.INFO)
 
@@ -33,9 +37,6 @@ def get_tables_from_dbt(dbt_manifest, dbt_db_name):
 def get_auto_register_tables(dbt_tables):    
     return [k for k, v in dbt_tables.items() if v.get('meta').get('bi_integration', {}).get('auto_register', False)]
 
-def filter_by_kind(sst_datasets, kind):
-    return {k:v for k, v in sst_datasets.items() if v.get('kind') == kind}
-
 def convert_markdown_to_plain_text(md_string):
     """Converts a markdown string to plaintext.
 
@@ -143,13 +144,11 @@ def merge_columns_info(dataset, dbt_tables, debug_dir):
     if debug_dir is not None:
         # Superset columns:
         superset_columns_file_path = os.path.join(debug_dir, f'superset_columns__dataset_{id}.json')
-        with open(superset_columns_file_path, 'w') as fp:
-            json.dump(sst_columns, fp, sort_keys=True, indent=4)
+        dump_json_file(sst_columns, superset_columns_file_path)
 
         # dbt columns:
         dbt_columns_file_path = os.path.join(debug_dir, f'dbt_columns__dataset_{id}.json')
-        with open(dbt_columns_file_path, 'w') as fp:
-            json.dump(dbt_columns, fp, sort_keys=True, indent=4)
+        dump_json_file(dbt_columns, dbt_columns_file_path)
 
 
     columns_new = []
@@ -239,20 +238,24 @@ def merge_columns_info(dataset, dbt_tables, debug_dir):
 
     return dataset
 
-def main(dbt_project_dir, dbt_db_name, superset_db_id, superset_debug_dir, superset_refresh_columns, superset):
+def main(dbt_project_dir, dbt_db_name, superset_db_id, superset_debug_dir, superset_refresh_columns, superset,
+         journal=None):
+    if journal is None:
+        journal = Journal()
 
     logging.info("Getting datasets from Superset.")
     sst_datasets = superset.get_datasets(superset_db_id)
 
-    sst_physical_datasets = filter_by_kind(sst_datasets, 'physical')
+    # Both are live views, they reflect the datasets registered and renamed below
+    sst_physical_datasets = sst_datasets.by_kind('physical')
     logging.info("There are %d physical datasets in Superset.", len(sst_physical_datasets))
 
-    sst_virtual_datasets = filter_by_kind(sst_datasets, 'virtual')
+    sst_virtual_datasets = sst_datasets.by_kind('virtual')
     logging.info("There are %d virtual datasets in Superset.", len(sst_virtual_datasets))
 
     logging.info("Reading manifest.json.")
-    with open(f'{dbt_project_dir}/target/manifest.json') as f:
-        dbt_manifest = json.load(f)
+    with open(f'{dbt_project_dir}/target/manifest.json', 'rb') as f:
+        dbt_manifest = json_loads(f.read())
 
     dbt_tables = get_tables_from_dbt(dbt_manifest, dbt_db_name)
     logging.info("There are %d datasets in DBT.", len(dbt_tables))
@@ -266,37 +269,57 @@ def main(dbt_project_dir, dbt_db_name, superset_db_id, superset_debug_dir, super
 
     # check if the names we want to use are not occupied by virtual datasets
     # in case they are, we need to rename them
-    datasets_to_rename = {k: v for k, v in sst_virtual_datasets.items() if k in tables_to_register}
-    for table in datasets_to_rename:
-        superset.rename_dataset(datasets_to_rename[table]['dataset_id'],
-                               datasets_to_rename[table]["schema"] + ".[renamed] " + datasets_to_rename[table]["table_name"] )
+    datasets_to_rename = [sst_virtual_datasets[table] for table in tables_to_register if table in sst_virtual_datasets]
+    for dataset in datasets_to_rename:
+        new_name = dataset.schema + ".[renamed] " + dataset.table_name
+        new_dataset_id = superset.rename_dataset(dataset.dataset_id, new_name)
+        sst_datasets.delete(dataset.dataset_id)
+        if new_dataset_id is not None:
+            sst_datasets.insert(DatasetRecord(new_dataset_id, dataset.kind, dataset.schema, new_name))
 
     # Register them
     for table in tables_to_register:
         try:
-            superset.create_physical_dataset(superset_db_id, table)
+            dataset_id = superset.create_physical_dataset(superset_db_id, table)
         except Exception as e:
+            # not every exception carries an HTTP response, e.g. a response without the new dataset's ID
+            response = getattr(e, 'response', None)
             logging.error("The database table %s could not be registered. %s",
-                          table, e.response.json()['message'])
+                          table, response.json()['message'] if response is not None else repr(e))
+            continue
+
+        schema_name, table_name = table.split('.')
+        sst_datasets.insert(DatasetRecord(dataset_id, 'physical', schema_name, table_name))
 
-    # Re-fetch Superset datasets, as we have just registered new ones
-    sst_datasets = superset.get_datasets(superset_db_id)
-    sst_physical_datasets = filter_by_kind(sst_datasets, 'physical')
     logging.info("There are %d physical datasets in Superset.", len(sst_physical_datasets))
 
     for sst_dataset in sst_physical_datasets:
-        sst_dataset_id = sst_physical_datasets[sst_dataset]['dataset_id']
+        sst_dataset_id = sst_physical_datasets[sst_dataset].dataset_id
 
         logging.info("Processing dataset ID: %d, name: %s.", sst_dataset_id, sst_dataset)
 
         # Only process datasets which exist in dbt:
         if sst_dataset in dbt_tables:
+            # Skip datasets which have already been put with the same dbt inputs by an interrupted run
+            payload_hash = hash_payload({'dbt_table': dbt_tables[sst_dataset],
+                                         'dbt_db_name': dbt_db_name,
+                                         'superset_refresh_columns': superset_refresh_columns,
+                                         'superset_url': superset.api_url,
+                                         'superset_db_id': superset_db_id})
+            if journal.is_completed(sst_dataset_id, 'put', payload_hash):
+                logging.info("Skipping dataset ID: %d, it has already been pushed.", sst_dataset_id)
+                continue
+
             try:
-                if superset_refresh_columns:
+                if superset_refresh_columns and not journal.is_completed(sst_dataset_id, 'refreshed', payload_hash):
                     superset.refresh_dataset(sst_dataset_id)
+                    journal.record(sst_dataset_id, 'refreshed', payload_hash)
                 sst_dataset_w_cols = superset.get_columns(sst_dataset_id)
+                journal.record(sst_dataset_id, 'fetched', payload_hash)
                 sst_dataset_w_cols_new = merge_columns_info(sst_dataset_w_cols, dbt_tables, superset_debug_dir)
+                journal.record(sst_dataset_id, 'merged', payload_hash)
                 superset.put_columns(sst_dataset_w_cols_new, superset_debug_dir)
+                journal.record(sst_dataset_id, 'put', payload_hash)
             except Exception as e:
                 logging.error("The dataset named %s with ID=%d wasn't updated. Check the error below.",
                             sst_dataset, sst_dataset_id, exc_info=e)
@@ -4,22 +4,20 @@ import os
 import yaml
 from bs4 import BeautifulSoup
 from markdown import markdown
+from .journal import Journal, hash_payload
 from .superset_api import Superset
 import os
 
 logging.basicConfig(level=logging.INFO)
 
-def get_dataset_id_by_schema_table(datasets, schema, table):
-    for dataset in datasets:
-        if datasets[dataset]['schema'] == schema and datasets[dataset]['table_name'] == table:
-            return datasets[dataset]['dataset_id']
-    return None
-
 def make_table_name(table, tags):
     return str(sorted(tags)).replace("'","") + " " + table
 
 
-def main(datasets_dir, superset_db_id, superset_refresh_columns, superset):
+def main(datasets_dir, superset_db_id, superset_refresh_columns, superset, journal=None):
+    if journal is None:
+        journal = Journal()
+
     datasets_superset = superset.get_datasets(superset_db_id)
 
     input_datasets={}
@@ -40,26 +38,41 @@ def main(datasets_dir, superset_db_id, superset_refresh_columns, superset):
                 input_datasets[noext_filename]["sql"] = s.read()                
 
     for i in input_datasets:
-        # refresh columns
-        superset.refresh_dataset(i)
-        
-        # get columns from dataset definition
-        columns_from_yml = { x['name'].upper() : x for x in input_datasets[i]['columns'] }
-
         # get descriptions from propagated columns from parent datasets in superset
         columns_from_propagation = {}
 
         for j in reversed(input_datasets[i].get('propagate_columns_from', [])):
-            ds_id = get_dataset_id_by_schema_table(datasets_superset, j['schema'], j['table'])
-            if ds_id is None:
+            parent_dataset = datasets_superset.get_by_schema_table(j['schema'], j['table'])
+            if parent_dataset is None:
                 logging.error("The dataset %s.%s does not exist in Superset. Please check your propagate_columns_from section in %s.yml.", j['schema'], j['table'], i)
                 continue
-            cols = { x['column_name'].upper() : x for x in superset.get_columns(ds_id)['columns'] if x.get('description') is not None}
+            cols = { x['column_name'].upper() : x for x in superset.get_columns(parent_dataset.dataset_id)['columns'] if x.get('description') is not None}
             columns_from_propagation |= cols
 
+        # skip datasets which have already been pushed with the same inputs by an interrupted run;
+        # only the propagated fields are hashed, as ids and timestamps change on every physical push
+        propagated_fields = {name: {field: column.get(field) for field in ['description', 'type', 'verbose_name']}
+                             for name, column in columns_from_propagation.items()}
+        payload_hash = hash_payload({'dataset': input_datasets[i],
+                                     'columns_from_propagation': propagated_fields,
+                                     'superset_url': superset.api_url,
+                                     'superset_db_id': superset_db_id})
+        if journal.is_completed(i, 'put', payload_hash):
+            logging.info("Skipping dataset %s, it has already been pushed.", i)
+            continue
+
+        # refresh columns
+        if not journal.is_completed(i, 'refreshed', payload_hash):
+            superset.refresh_dataset(i)
+            journal.record(i, 'refreshed', payload_hash)
+
+        # get columns from dataset definition
+        columns_from_yml = { x['name'].upper() : x for x in input_datasets[i]['columns'] }
+
         # get columns from superset's dataset
         keys_allowed_to_update=['advanced_data_type', 'column_name', 'description', 'expression', 'extra', 'filterable', 'groupby', 'id', 'is_active', 'is_dttm', 'python_date_format', 'type', 'uuid', 'verbose_name']
         columns_from_ds = [{key: value for key, value in item.items() if key in keys_allowed_to_update} for item in superset.get_columns(i)['columns']]
+        journal.record(i, 'fetched', payload_hash)
 
 
         for c in columns_from_ds:
@@ -117,12 +130,14 @@ def main(datasets_dir, superset_db_id, superset_refresh_columns, superset):
         ]
         ds['owners']=[1]
         ds['columns']=columns_from_ds
+        journal.record(i, 'merged', payload_hash)
 
 
         # clear existing metrics (failing to do this results in HTTP 422)
         superset.update_virtual_dataset(i, {"metrics":[]})
 
         # update dataset
-        superset.update_virtual_dataset(i, ds)       
+        superset.update_virtual_dataset(i, ds)
+        journal.record(i, 'put', payload_hash)
 
 
@@ -1,10 +1,54 @@
+import gzip
 import logging
 import json
 import os
 import requests
 
+from .dataset_index import DatasetIndex, DatasetRecord
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# Request bodies smaller than this are not worth compressing.
+GZIP_MIN_BODY_SIZE = 1024
+
+
+def json_dumps(obj):
+    """Serializes ``obj`` to UTF-8 encoded JSON bytes.
+
+    Uses ``orjson`` if it is installed and falls back to the stdlib ``json`` module
+    otherwise, or whenever ``orjson`` refuses the object (e.g. non-string dict keys).
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj)
+        except TypeError:
+            pass
+
+    return json.dumps(obj).encode('utf-8')
+
+
+def json_loads(data):
+    """Parses JSON from ``bytes`` or ``str`` using the fastest available codec."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dump_json_file(obj, file_path):
+    """Writes ``obj`` as pretty-printed JSON into ``file_path``, e.g. for the debug files.
+
+    Always uses the stdlib ``json`` module, so that the files look the same regardless
+    of the installed packages and can be diffed against each other.
+    """
+    with open(file_path, 'w') as fp:
+        json.dump(obj, fp, sort_keys=True, indent=4)
+
+
 class RegisterException(Exception):
     """Exception raised when a dataset cannot be registered.
 
@@ -20,7 +64,8 @@ class RegisterException(Exception):
 class Superset:
     """A class for accessing the Superset API in an easy way."""
 
-    def __init__(self, api_url, access_token=None, refresh_token=None, user=None, password=None):
+    def __init__(self, api_url, access_token=None, refresh_token=None, user=None, password=None,
+                 gzip_requests=False):
         """
         If ``access_token`` is None, attempts to obtain it using ``refresh_token``.
 
@@ -30,6 +75,8 @@ class Superset:
             refresh_token: Refresh token to use for obtaining or refreshing the ``access_token``
             user: Superset username to use for obtaining or refreshing the ``access_token``
             password: Superset password to use for obtaining or refreshing the ``access_token``
+            gzip_requests: Whether JSON request bodies should be sent gzip-compressed. The Superset
+                instance (or a proxy in front of it) has to accept ``Content-Encoding: gzip``.
         """
 
         self.api_url = api_url
@@ -37,6 +84,7 @@ class Superset:
         self.refresh_token = refresh_token
         self.user = user
         self.password = password
+        self.gzip_requests = gzip_requests
 
         if self.user is not None and self.password is not None:
             self._login()
@@ -51,14 +99,15 @@ class Superset:
             'refresh': True 
         }
         url = self.api_url + '/security/login'
-        res = requests.request('POST', url, headers={}, json=body)
+        res = requests.request('POST', url, headers={'Content-Type': 'application/json'}, data=json_dumps(body))
 
         if res.status_code != 200:
             logger.error("Login to Superset failed")
             exit(0)
 
-        self.access_token = res.json()['access_token']
-        self.refresh_token = res.json()['refresh_token']
+        tokens = json_loads(res.content)
+        self.access_token = tokens['access_token']
+        self.refresh_token = tokens['refresh_token']
 
         logger.info("Logged in successfully")
         return True
@@ -80,7 +129,7 @@ class Superset:
             logger.info("Refresh token failed")
             exit(0)
 
-        self.access_token= res.json()['access_token']
+        self.access_token = json_loads(res.content)['access_token']
 
     def _request(self, method, endpoint, **request_kwargs):
         """Executes a request against the Superset API.
@@ -105,9 +154,14 @@ class Superset:
         logger.info("About to %s execute request for endpoint %s", method, endpoint)
 
         session = requests.Session()
-        if json in request_kwargs:
+        if 'json' in request_kwargs:
             session.headers['Content-Type'] = 'application/json'
+            request_kwargs['data'], content_encoding = self._encode_body(request_kwargs.pop('json'))
+            if content_encoding is not None:
+                request_kwargs.setdefault('headers', {})['Content-Encoding'] = content_encoding
         session.headers['Accept'] = 'application/json'
+        # `Accept-Encoding` is left to requests, which advertises every encoding urllib3 can
+        # decode, e.g. `br` if brotli is installed or `zstd` with urllib3 2.x and zstandard
         csrf_url = self.api_url + '/security/csrf_token/'
 
         for _ in range(2):
@@ -128,15 +182,43 @@ class Superset:
         res = session.request(method, url, **request_kwargs)
 
         logger.debug("Request finished with status: %d and content: %s", res.status_code, res.content)
+        self._log_response_compression(res)
 
         res.raise_for_status()
-        return res.json()
-        
+        return json_loads(res.content)
+
+    def _encode_body(self, body):
+        """Serializes a JSON request body, gzip-compressing it if enabled and worthwhile.
+
+        Returns:
+            A tuple of the encoded body and its ``Content-Encoding`` (None if not compressed).
+        """
+        data = json_dumps(body)
+
+        if self.gzip_requests and len(data) >= GZIP_MIN_BODY_SIZE:
+            compressed = gzip.compress(data)
+            logger.info("Request body compressed from %d to %d bytes (%d bytes saved)",
+                        len(data), len(compressed), len(data) - len(compressed))
+            return compressed, 'gzip'
+
+        return data, None
+
+    @staticmethod
+    def _log_response_compression(res):
+        encoding = res.headers.get('Content-Encoding')
+        wire_length = res.headers.get('Content-Length')
+        if not encoding or wire_length is None or not wire_length.isdigit():
+            return
+
+        wire_length = int(wire_length)
+        logger.info("Response body received %s-compressed as %d bytes instead of %d (%d bytes saved)",
+                    encoding, wire_length, len(res.content), len(res.content) - wire_length)
+
     def get_datasets(self, superset_db_id):
         logging.info("Getting all datasets from Superset.")
 
         page_number = 0
-        datasets = {}
+        datasets = DatasetIndex()
 
         while True:
             logging.info("Getting page %d.", page_number + 1)
@@ -147,11 +229,7 @@ class Superset:
             
             for r in result:
                 if r["database"]["id"] == superset_db_id:
-                    dataset_key = f'{r["schema"]}.{r["table_name"]}'         
-                    datasets[dataset_key] = {"kind" : r["kind"],
-                                            "dataset_id":r['id'],
-                                            "schema": r["schema"],
-                                            "table_name": r["table_name"]}
+                    datasets.insert(DatasetRecord(r['id'], r["kind"], r["schema"], r["table_name"]))
             page_number += 1
         
         return datasets
@@ -174,7 +252,8 @@ class Superset:
             "table_name": table_name
         }
 
-        self._request('POST', f"/dataset/", json=body)
+        res = self._request('POST', f"/dataset/", json=body)
+        return res['id']
 
     def refresh_dataset(self, dataset_id):
         logging.info("Refreshing columns in Superset.")
@@ -187,8 +266,7 @@ class Superset:
 
         if debug_dir is not None:
             merged_dataset_file_path = os.path.join(debug_dir, f'merged__dataset_{id}.json')
-            with open(merged_dataset_file_path, 'w') as fp:
-                json.dump(dataset, fp, sort_keys=True, indent=4)
+            dump_json_file(dataset, merged_dataset_file_path)
 
 
         body = dataset['meta_new']
@@ -196,21 +274,28 @@ class Superset:
 
         if debug_dir is not None:
             update_body_file_path = os.path.join(debug_dir, f'update_body__dataset_{id}.json')
-            with open(update_body_file_path, 'w') as fp:
-                json.dump(body, fp, sort_keys=True, indent=4)
+            dump_json_file(body, update_body_file_path)
 
         self._request('PUT', f"/dataset/{dataset['id']}?override_columns=true", json=body)
 
     def rename_dataset(self, dataset_id, new_name):
+        """Renames a dataset by duplicating it under ``new_name`` and deleting the original.
+
+        Returns:
+            The ID of the renamed dataset, or None if the duplication failed.
+        """
         logging.info("Rename dataset %d to %s.", dataset_id, new_name)
+        new_dataset_id = None
         try:
-            self._request('POST', f"/dataset/duplicate", json={"base_model_id": dataset_id, "table_name": new_name})
+            res = self._request('POST', f"/dataset/duplicate", json={"base_model_id": dataset_id, "table_name": new_name})
+            new_dataset_id = res.get('id')
         except requests.RequestException as e:
             # it means that renamed is already there, we have to do something
             # so we just forget the current one. This is extremely unlikely to cause issues
             logging.warning("Failed to rename the dataset %s.", e.response.json()['message'])
         # finally delete the old one
         self._request('DELETE', f"/dataset/{dataset_id}")
+        return new_dataset_id
 
     def update_virtual_dataset(self, dataset_id, dataset):
         logging.info("Updating dataset %s.", str(dataset_id))
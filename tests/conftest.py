@@ -0,0 +1,86 @@
+import os
+import time
+import tracemalloc
+
+import pytest
+
+_benchmark_results = []
+
+
+def pytest_addoption(parser):
+    parser.addoption('--run-benchmarks', action='store_true', default=False,
+                     help="Run the micro-benchmarks, which are also run if BENCHMARK_SCALE is set.")
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "benchmark: micro-benchmark, only run with --run-benchmarks or BENCHMARK_SCALE")
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption('--run-benchmarks') or 'BENCHMARK_SCALE' in os.environ:
+        return
+
+    skip_benchmark = pytest.mark.skip(reason="needs --run-benchmarks or BENCHMARK_SCALE to run")
+    for item in items:
+        if 'benchmark' in item.keywords:
+            item.add_marker(skip_benchmark)
+
+
+@pytest.fixture
+def measure(request):
+    """Measures the time and peak memory of a function call.
+
+    Timing is delegated to the ``benchmark`` fixture of pytest-benchmark if it is installed and
+    enabled, otherwise the best of ``rounds`` calls is taken. Peak memory is traced by ``tracemalloc``
+    in a separate call after an untraced warm-up call, so that neither one-time setup costs nor
+    tracing distort the numbers.
+    """
+    try:
+        benchmark = request.getfixturevalue('benchmark')
+    except pytest.FixtureLookupError:
+        benchmark = None
+
+    def run(func, *args, rounds=5, **kwargs):
+        nonlocal benchmark
+
+        # pytest-benchmark collects no stats if disabled, e.g. by --benchmark-disable or under xdist;
+        # the disabled fixture just calls the function, so it still serves for the warm-up call
+        if benchmark is not None and benchmark.disabled:
+            benchmark(func, *args, **kwargs)
+            benchmark = None
+        else:
+            func(*args, **kwargs)
+
+        tracemalloc.start()
+        try:
+            result = func(*args, **kwargs)
+            _, peak_memory = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        if benchmark is not None:
+            benchmark.extra_info['peak_memory_kib'] = peak_memory / 1024
+            benchmark.pedantic(func, args, kwargs, rounds=rounds)
+            best_time = benchmark.stats.stats.min
+        else:
+            timings = []
+            for _ in range(rounds):
+                start = time.perf_counter()
+                func(*args, **kwargs)
+                timings.append(time.perf_counter() - start)
+            best_time = min(timings)
+
+        _benchmark_results.append((request.node.name, best_time, peak_memory))
+        return result
+
+    return run
+
+
+def pytest_terminal_summary(terminalreporter):
+    if not _benchmark_results:
+        return
+
+    terminalreporter.write_sep('-', 'benchmarks: best time and peak memory')
+    width = max(len(name) for name, _, _ in _benchmark_results)
+    for name, best_time, peak_memory in _benchmark_results:
+        terminalreporter.write_line(f'{name:<{width}}  {best_time * 1000:10.2f} ms  {peak_memory / 1024:10.1f} KiB')
@@ -0,0 +1,166 @@
+"""Generator of synthetic dbt manifests and matching Superset dataset payloads.
+
+Production manifests cannot be shared, so the benchmarks in ``test_benchmarks.py`` run
+against data of a realistic shape produced here instead.
+"""
+
+import random
+
+from dbt_superset_lineage.dataset_index import DatasetIndex, DatasetRecord
+
+WORDS = ['order', 'customer', 'revenue', 'session', 'event', 'amount', 'country', 'status',
+         'created', 'updated', 'product', 'quantity', 'discount', 'channel', 'currency', 'user',
+         'account', 'invoice', 'payment', 'refund', 'campaign', 'device', 'region', 'segment']
+
+COLUMN_TYPES = ['VARCHAR', 'INTEGER', 'BIGINT', 'NUMERIC(38, 2)', 'BOOLEAN', 'DATE', 'TIMESTAMP']
+
+
+def _words(rng, count):
+    return [rng.choice(WORDS) for _ in range(count)]
+
+
+def make_description(rng, words, markdown_density):
+    """Returns a description of ``words`` words.
+
+    ``markdown_density`` (0..1) is the probability of a word being formatted (bold, italic,
+    inline code or a link) and of a sentence becoming a list item, heading or quote.
+    Only Markdown rendered by python-markdown without extensions is used, i.e. no fenced code blocks.
+    """
+    sentences = []
+    remaining = words
+
+    while remaining > 0:
+        length = min(remaining, rng.randint(6, 16))
+        remaining -= length
+
+        tokens = []
+        for word in _words(rng, length):
+            if rng.random() < markdown_density:
+                word = rng.choice(['**{}**', '_{}_', '`{}`', '[{}](https://docs.example.com/{})']).format(word, word)
+            tokens.append(word)
+        sentence = ' '.join(tokens).capitalize() + '.'
+
+        if rng.random() < markdown_density:
+            sentence = rng.choice(['- {}', '1. {}', '### {}', '> {}']).format(sentence)
+        sentences.append(sentence)
+
+    return '\n\n'.join(sentences)
+
+
+def _column_name(rng, index):
+    return '_'.join(_words(rng, 2)) + f'_{index}'
+
+
+def _model_meta(rng, columns, bi_integration_ratio, auto_register):
+    # `merge_columns_info` requires a main timestamp column for every model;
+    # `bi_integration_ratio` controls how many models use the optional settings as well.
+    bi_integration = {'main_timestamp_column': rng.choice(columns), 'auto_register': auto_register}
+    meta = {'bi_integration': bi_integration, 'owners': [1]}
+
+    if rng.random() < bi_integration_ratio:
+        bi_integration.update({
+            'prohibit_manual_editing': rng.random() < 0.5,
+            'results_cache_timeout_seconds': rng.choice([None, 600, 3600]),
+            'filter_value_extraction': {'enable': True, 'where': f'{rng.choice(columns)} IS NOT NULL'},
+            'warning_markdown': 'Contains **preliminary** data.',
+        })
+        meta['model_maturity'] = rng.choice(['high', 'medium', 'low'])
+        meta['certification'] = {'certified_by': 'Data Platform Team', 'details': 'Synthetic model'}
+
+    return meta
+
+
+def _column_meta(rng, bi_integration_ratio):
+    meta = {}
+    if rng.random() < bi_integration_ratio:
+        meta['verbose_name'] = ' '.join(_words(rng, 2)).title()
+        meta['bi_integration'] = {'is_filterable': rng.random() < 0.5, 'is_groupable': rng.random() < 0.5}
+        if rng.random() < 0.2:
+            meta['unit'] = rng.choice(['EUR', 's', '%'])
+    return meta
+
+
+def generate_manifest(models=100, columns_per_model=20, description_words=30, markdown_density=0.1,
+                      bi_integration_ratio=0.5, auto_register_ratio=0.25, sources=None, database='analytics',
+                      seed=0):
+    """Generates a dbt ``manifest.json``-like dictionary.
+
+    Args:
+        models: Number of models (``nodes``).
+        columns_per_model: Number of columns of each model and source.
+        description_words: Approximate number of words of each description.
+        markdown_density: Share of Markdown formatting in descriptions, from 0 to 1.
+        bi_integration_ratio: Share of models and columns using the ``bi_integration`` meta settings.
+        auto_register_ratio: Share of models and sources set to ``auto_register``, rounded to the nearest count.
+        sources: Number of sources, defaults to a tenth of ``models``.
+        database: Name of the database of all the nodes.
+        seed: Seed of the random generator, so that the output is reproducible.
+    """
+    rng = random.Random(seed)
+    sources = models // 10 if sources is None else sources
+    manifest = {'nodes': {}, 'sources': {}}
+
+    for table_type, count, prefix in [('nodes', models, 'model'), ('sources', sources, 'source')]:
+        auto_register = set(rng.sample(range(count), round(count * auto_register_ratio)))
+        for i in range(count):
+            name = f'{prefix}_{i}'
+            schema = f'schema_{i % 10}'
+            column_names = [_column_name(rng, j) for j in range(columns_per_model)]
+
+            columns = {c: {'name': c,
+                           'description': make_description(rng, description_words, markdown_density),
+                           'meta': _column_meta(rng, bi_integration_ratio)}
+                       for c in column_names}
+
+            manifest[table_type][f'{prefix}.project.{name}'] = {
+                'database': database,
+                'schema': schema,
+                'name': name,
+                'alias': name,
+                'description': make_description(rng, description_words, markdown_density),
+                'columns': columns,
+                'meta': _model_meta(rng, column_names, bi_integration_ratio, i in auto_register),
+            }
+
+    return manifest
+
+
+def generate_superset_datasets(manifest, virtual_ratio=0.1, superset_db_id=1, seed=0):
+    """Generates Superset datasets matching the tables of ``manifest``.
+
+    Returns:
+        A tuple of the ``DatasetIndex`` as returned by ``Superset.get_datasets`` and a dict of
+        dataset payloads by dataset id as returned by ``Superset.get_columns``.
+    """
+    rng = random.Random(seed)
+    datasets = DatasetIndex()
+    payloads = {}
+
+    tables = list(manifest['nodes'].values()) + list(manifest['sources'].values())
+    for dataset_id, table in enumerate(tables, start=1):
+        key = f"{table['schema']}.{table['alias']}"
+        kind = 'virtual' if rng.random() < virtual_ratio else 'physical'
+        datasets.insert(DatasetRecord(dataset_id, kind, table['schema'], table['alias']))
+
+        columns = [{'column_name': name.upper(),
+                    'description': None,
+                    'expression': None,
+                    'filterable': True,
+                    'groupby': True,
+                    'verbose_name': None,
+                    'type': rng.choice(COLUMN_TYPES),
+                    'advanced_data_type': None,
+                    'extra': '{}',
+                    'is_active': True,
+                    'is_dttm': False,
+                    'python_date_format': None} for name in table['columns']]
+
+        payloads[dataset_id] = {'name': key, 'id': dataset_id, 'columns': columns,
+                                'meta': {'cache_timeout': None,
+                                         'description': None,
+                                         'fetch_values_predicate': None,
+                                         'filter_select_enabled': False,
+                                         'main_dttm_col': None,
+                                         'database': {'id': superset_db_id}}}
+
+    return datasets, payloads
@@ -0,0 +1,64 @@
+"""Micro-benchmarks of the hot spots of ``push-physical-datasets`` on synthetic data.
+
+The benchmarks only run with ``--run-benchmarks`` or if the ``BENCHMARK_SCALE`` environment variable
+is set, which scales the size of the data, e.g. ``BENCHMARK_SCALE=50 pytest tests/test_benchmarks.py``
+benchmarks 5000 models.
+"""
+
+import os
+
+import pytest
+
+from dbt_superset_lineage.push_physical_datasets import (convert_markdown_to_plain_text, get_auto_register_tables,
+                                                         get_tables_from_dbt, merge_columns_info)
+from .synthetic import generate_manifest, generate_superset_datasets
+
+SCALE = int(os.environ.get('BENCHMARK_SCALE', 1))
+AUTO_REGISTER_RATIO = 0.25
+
+pytestmark = pytest.mark.benchmark
+
+
+@pytest.fixture(scope='module')
+def manifest():
+    return generate_manifest(models=100 * SCALE, columns_per_model=20, auto_register_ratio=AUTO_REGISTER_RATIO)
+
+
+@pytest.fixture(scope='module')
+def dbt_tables(manifest):
+    return get_tables_from_dbt(manifest, None)
+
+
+@pytest.fixture(scope='module')
+def superset_datasets(manifest):
+    return generate_superset_datasets(manifest)
+
+
+def test_get_tables_from_dbt(measure, manifest):
+    tables = measure(get_tables_from_dbt, manifest, None)
+    assert len(tables) == len(manifest['nodes']) + len(manifest['sources'])
+
+
+def test_get_auto_register_tables(measure, manifest, dbt_tables):
+    tables = measure(get_auto_register_tables, dbt_tables)
+    expected = round(len(manifest['nodes']) * AUTO_REGISTER_RATIO) + round(len(manifest['sources']) * AUTO_REGISTER_RATIO)
+    assert len(tables) == expected
+
+
+@pytest.mark.parametrize('markdown_density', [0.0, 0.1, 0.5])
+def test_convert_markdown_to_plain_text(measure, markdown_density):
+    manifest = generate_manifest(models=10 * SCALE, columns_per_model=10, description_words=50,
+                                 markdown_density=markdown_density, sources=0)
+    descriptions = [c['description'] for n in manifest['nodes'].values() for c in n['columns'].values()]
+
+    texts = measure(lambda: [convert_markdown_to_plain_text(d) for d in descriptions], rounds=3)
+    assert not any('**' in t for t in texts)
+
+
+def test_merge_columns_info(measure, dbt_tables, superset_datasets):
+    datasets, payloads = superset_datasets
+    physical_datasets = datasets.by_kind('physical')
+    to_merge = [payloads[d.dataset_id] for k, d in physical_datasets.items() if k in dbt_tables]
+
+    merged = measure(lambda: [merge_columns_info(d, dbt_tables, None) for d in to_merge], rounds=3)
+    assert all(len(d['columns_new']) == len(d['columns']) for d in merged)
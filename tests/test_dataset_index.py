@@ -0,0 +1,38 @@
+from dbt_superset_lineage.dataset_index import DatasetIndex, DatasetRecord
+
+
+def test_lookups():
+    index = DatasetIndex([DatasetRecord(1, 'physical', 'core', 'orders'),
+                          DatasetRecord(2, 'virtual', 'core', 'customers')])
+
+    assert index.get_by_id(1).key == 'core.orders'
+    assert index.get_by_schema_table('core', 'customers').dataset_id == 2
+    assert 'core.orders' in index
+    assert list(index.by_kind('physical')) == ['core.orders']
+    assert index.get_by_id(3) is None
+    assert len(index.by_kind('unknown')) == 0
+
+
+def test_kind_views_reflect_insert_and_delete():
+    index = DatasetIndex([DatasetRecord(1, 'virtual', 'core', 'orders')])
+    physical = index.by_kind('physical')
+    virtual = index.by_kind('virtual')
+
+    # rename the virtual dataset and register a physical one in its place
+    index.delete(1)
+    index.insert(DatasetRecord(3, 'virtual', 'core', '[renamed] orders'))
+    index.insert(DatasetRecord(2, 'physical', 'core', 'orders'))
+
+    assert physical['core.orders'].dataset_id == 2
+    assert list(virtual) == ['core.[renamed] orders']
+    assert index.get_by_id(1) is None
+    assert len(index) == 2
+
+
+def test_insert_replaces_same_key():
+    index = DatasetIndex([DatasetRecord(1, 'virtual', 'core', 'orders')])
+    index.insert(DatasetRecord(2, 'physical', 'core', 'orders'))
+
+    assert index.get_by_id(1) is None
+    assert len(index.by_kind('virtual')) == 0
+    assert index['core.orders'].dataset_id == 2
@@ -0,0 +1,44 @@
+from dbt_superset_lineage.journal import Journal, hash_payload
+
+
+def test_resume_skips_completed_phases(tmp_path):
+    journal_file = tmp_path / 'journal.jsonl'
+    payload_hash = hash_payload({'columns': {'id': {'description': 'Identifier'}}})
+
+    with Journal(journal_file) as journal:
+        journal.record(1, 'fetched', payload_hash)
+        journal.record(1, 'put', payload_hash)
+        journal.record(2, 'refreshed', payload_hash)
+
+    # simulate a run killed while writing an entry
+    with open(journal_file, 'a') as fp:
+        fp.write('{"dataset_id": 2, "pha')
+
+    with Journal(journal_file, resume=True) as journal:
+        assert journal.is_completed(1, 'put', payload_hash)
+        assert journal.is_completed(2, 'refreshed', payload_hash)
+        assert not journal.is_completed(2, 'put', payload_hash)
+        assert not journal.is_completed(1, 'put', hash_payload({'columns': {}}))
+        journal.record(2, 'put', payload_hash)
+
+    with Journal(journal_file, resume=True) as journal:
+        assert journal.is_completed(2, 'put', payload_hash)
+
+
+def test_new_journal_discards_previous_run(tmp_path):
+    journal_file = tmp_path / 'journal.jsonl'
+
+    with Journal(journal_file) as journal:
+        journal.record(1, 'put', 'abc')
+
+    with Journal(journal_file) as journal:
+        assert not journal.is_completed(1, 'put', 'abc')
+
+    with Journal(journal_file, resume=True) as journal:
+        assert not journal.is_completed(1, 'put', 'abc')
+
+
+def test_journal_without_file_records_nothing(tmp_path):
+    with Journal() as journal:
+        journal.record(1, 'put', 'abc')
+        assert not journal.is_completed(1, 'put', 'abc')
@@ -0,0 +1,135 @@
+import copy
+import json
+
+import pytest
+
+from dbt_superset_lineage.dataset_index import DatasetIndex, DatasetRecord
+from dbt_superset_lineage.journal import Journal
+from dbt_superset_lineage.push_physical_datasets import main
+from .synthetic import generate_manifest, generate_superset_datasets
+
+
+class FakeSuperset:
+    api_url = 'https://superset/api/v1'
+
+    def __init__(self, datasets, payloads, kill_at_put=None):
+        self.datasets = datasets
+        self.payloads = payloads
+        self.kill_at_put = kill_at_put
+        self.calls = []
+
+    def get_datasets(self, superset_db_id):
+        self.calls.append(('get_datasets', superset_db_id))
+        return DatasetIndex(self.datasets[key] for key in self.datasets)
+
+    def create_physical_dataset(self, superset_db_id, table):
+        # a response without the ID of the new dataset
+        return {}['id']
+
+    def refresh_dataset(self, dataset_id):
+        self.calls.append(('refresh', dataset_id))
+
+    def get_columns(self, dataset_id):
+        self.calls.append(('get_columns', dataset_id))
+        return copy.deepcopy(self.payloads[dataset_id])
+
+    def put_columns(self, dataset, debug_dir):
+        self.calls.append(('put', dataset['id']))
+        if self.kill_at_put == sum(call[0] == 'put' for call in self.calls):
+            # e.g. an expired token, which exits the whole run
+            raise SystemExit(0)
+
+
+def write_manifest(project_dir, manifest):
+    (project_dir / 'target').mkdir(exist_ok=True)
+    (project_dir / 'target' / 'manifest.json').write_text(json.dumps(manifest))
+
+
+def test_failed_registration_is_logged(tmp_path, caplog):
+    manifest = generate_manifest(models=4, columns_per_model=2, auto_register_ratio=1.0)
+    write_manifest(tmp_path, manifest)
+    superset = FakeSuperset(DatasetIndex(), {})
+
+    main(str(tmp_path), None, 1, None, False, superset)
+
+    assert "could not be registered. KeyError('id')" in caplog.text
+    assert superset.calls == [('get_datasets', 1)]
+
+
+def test_resume_skips_completed_datasets(tmp_path):
+    manifest = generate_manifest(models=4, columns_per_model=2, auto_register_ratio=0.0, sources=0)
+    write_manifest(tmp_path, manifest)
+    datasets, payloads = generate_superset_datasets(manifest, virtual_ratio=0.0)
+    journal_file = tmp_path / 'journal.jsonl'
+
+    superset = FakeSuperset(datasets, payloads, kill_at_put=3)
+    with pytest.raises(SystemExit), Journal(journal_file) as journal:
+        main(str(tmp_path), None, 1, None, True, superset, journal)
+    assert superset.calls[-3:] == [('refresh', 3), ('get_columns', 3), ('put', 3)]
+
+    # the dbt model of dataset 1 changes before the push is resumed
+    manifest['nodes']['model.project.model_0']['description'] = 'Changed.'
+    write_manifest(tmp_path, manifest)
+
+    superset = FakeSuperset(datasets, payloads)
+    with Journal(journal_file, resume=True) as journal:
+        main(str(tmp_path), None, 1, None, True, superset, journal)
+
+    assert superset.calls == [('get_datasets', 1),
+                              ('refresh', 1), ('get_columns', 1), ('put', 1),
+                              ('get_columns', 3), ('put', 3),
+                              ('refresh', 4), ('get_columns', 4), ('put', 4)]
+
+
+def test_resume_with_refresh_repeats_datasets_put_without_it(tmp_path):
+    manifest = generate_manifest(models=2, columns_per_model=2, auto_register_ratio=0.0, sources=0)
+    write_manifest(tmp_path, manifest)
+    datasets, payloads = generate_superset_datasets(manifest, virtual_ratio=0.0)
+    journal_file = tmp_path / 'journal.jsonl'
+
+    with Journal(journal_file) as journal:
+        main(str(tmp_path), None, 1, None, False, FakeSuperset(datasets, payloads), journal)
+
+    superset = FakeSuperset(datasets, payloads)
+    with Journal(journal_file, resume=True) as journal:
+        main(str(tmp_path), None, 1, None, True, superset, journal)
+
+    assert ('refresh', 1) in superset.calls and ('put', 2) in superset.calls
+
+
+class RegisteringSuperset(FakeSuperset):
+    """Returns the IDs of renamed and registered datasets like the Superset API does."""
+
+    def __init__(self, datasets, payloads, new_ids):
+        super().__init__(datasets, payloads)
+        self.new_ids = iter(new_ids)
+
+    def rename_dataset(self, dataset_id, new_name):
+        new_dataset_id = next(self.new_ids)
+        self.calls.append(('rename', dataset_id, new_dataset_id))
+        return new_dataset_id
+
+    def create_physical_dataset(self, superset_db_id, table):
+        dataset_id = next(self.new_ids)
+        self.calls.append(('create', table, dataset_id))
+        return dataset_id
+
+
+def test_registered_datasets_are_pushed_without_refetching(tmp_path):
+    manifest = generate_manifest(models=2, columns_per_model=2, auto_register_ratio=1.0, sources=0)
+    write_manifest(tmp_path, manifest)
+    _, payloads = generate_superset_datasets(manifest)
+    payloads = {30: dict(payloads[1], id=30), 31: dict(payloads[2], id=31)}
+
+    # a virtual dataset occupies the name of the first table to register
+    datasets = DatasetIndex([DatasetRecord(10, 'virtual', 'schema_0', 'model_0')])
+    superset = RegisteringSuperset(datasets, payloads, new_ids=[20, 30, 31])
+
+    main(str(tmp_path), None, 1, None, True, superset)
+
+    assert superset.calls == [('get_datasets', 1),
+                              ('rename', 10, 20),
+                              ('create', 'schema_0.model_0', 30),
+                              ('create', 'schema_1.model_1', 31),
+                              ('refresh', 30), ('get_columns', 30), ('put', 30),
+                              ('refresh', 31), ('get_columns', 31), ('put', 31)]
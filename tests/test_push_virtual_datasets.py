@@ -0,0 +1,76 @@
+import pytest
+import yaml
+
+from dbt_superset_lineage.dataset_index import DatasetIndex, DatasetRecord
+from dbt_superset_lineage.journal import Journal
+from dbt_superset_lineage.push_virtual_datasets import main
+
+PARENT_ID = 100
+
+
+class FakeSuperset:
+    api_url = 'https://superset/api/v1'
+
+    def __init__(self, kill_at_put=None, parent_changed_on='2024-01-01'):
+        self.kill_at_put = kill_at_put
+        self.parent_changed_on = parent_changed_on
+        self.calls = []
+
+    def get_datasets(self, superset_db_id):
+        return DatasetIndex([DatasetRecord(PARENT_ID, 'physical', 'core', 'orders')])
+
+    def refresh_dataset(self, dataset_id):
+        self.calls.append(('refresh', dataset_id))
+
+    def get_columns(self, dataset_id):
+        if dataset_id == PARENT_ID:
+            # ids and timestamps of the parent change whenever it is pushed
+            return {'columns': [{'column_name': 'ID', 'description': 'Order ID', 'type': 'INTEGER',
+                                 'verbose_name': 'Id', 'id': 1, 'changed_on': self.parent_changed_on}]}
+
+        self.calls.append(('get_columns', dataset_id))
+        return {'columns': [{'column_name': 'ID', 'description': None, 'type': None, 'verbose_name': None}]}
+
+    def update_virtual_dataset(self, dataset_id, dataset):
+        if 'table_name' not in dataset:
+            # clearing the metrics before the actual update
+            return
+
+        self.calls.append(('put', dataset_id))
+        if self.kill_at_put == sum(call[0] == 'put' for call in self.calls):
+            # e.g. an expired token, which exits the whole run
+            raise SystemExit(0)
+
+
+def write_dataset(datasets_dir, dataset_id, description):
+    definition = {'name': f'dataset_{dataset_id}', 'tags': ['test'], 'description': description,
+                  'results_cache_timeout_seconds': None,
+                  'propagate_columns_from': [{'schema': 'core', 'table': 'orders'}]}
+    (datasets_dir / f'{dataset_id}.yml').write_text(yaml.safe_dump(definition))
+    (datasets_dir / f'{dataset_id}.sql').write_text('SELECT id FROM core.orders')
+
+
+def test_resume_skips_completed_datasets(tmp_path):
+    for dataset_id in ['1', '2', '3', '4']:
+        write_dataset(tmp_path, dataset_id, 'Orders.')
+    journal_file = tmp_path / 'journal.jsonl'
+
+    superset = FakeSuperset(kill_at_put=3)
+    with pytest.raises(SystemExit), Journal(journal_file) as journal:
+        main(str(tmp_path), 1, False, superset, journal)
+    order = [dataset_id for call, dataset_id in superset.calls if call == 'refresh']
+    completed, interrupted, remaining = order[:2], order[2], ({'1', '2', '3', '4'} - set(order)).pop()
+
+    # a completed dataset changes before the push is resumed, and the parent was pushed meanwhile
+    write_dataset(tmp_path, completed[0], 'Changed.')
+
+    superset = FakeSuperset(parent_changed_on='2024-01-02')
+    with Journal(journal_file, resume=True) as journal:
+        main(str(tmp_path), 1, False, superset, journal)
+
+    assert superset.calls.count(('refresh', completed[0])) == 1
+    assert ('put', completed[0]) in superset.calls
+    assert not [call for call in superset.calls if call[1] == completed[1]]
+    assert ('refresh', interrupted) not in superset.calls
+    assert ('get_columns', interrupted) in superset.calls and ('put', interrupted) in superset.calls
+    assert ('put', remaining) in superset.calls
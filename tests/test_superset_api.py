@@ -0,0 +1,124 @@
+import gzip
+import json
+
+from dbt_superset_lineage import superset_api
+from dbt_superset_lineage.superset_api import GZIP_MIN_BODY_SIZE, Superset, json_dumps, json_loads
+
+
+class FakeResponse:
+    def __init__(self, body, headers=None):
+        self.content = json.dumps(body).encode('utf-8')
+        self.headers = headers or {}
+        self.status_code = 200
+
+    def json(self):
+        return json_loads(self.content)
+
+    def raise_for_status(self):
+        pass
+
+
+class FakeSession:
+    requests = []
+
+    def __init__(self):
+        self.headers = {}
+
+    def get(self, url):
+        return FakeResponse({'result': 'csrf-token'})
+
+    def request(self, method, url, **kwargs):
+        FakeSession.requests.append((dict(self.headers), kwargs))
+        return FakeResponse({'id': 1})
+
+
+def make_superset(gzip_requests=False):
+    return Superset('https://superset/api/v1', access_token='token', gzip_requests=gzip_requests)
+
+
+def test_json_dumps_falls_back_to_stdlib(monkeypatch):
+    class RefusingOrjson:
+        @staticmethod
+        def dumps(obj):
+            raise TypeError('Dict key must be str')
+
+    monkeypatch.setattr(superset_api, 'orjson', RefusingOrjson)
+
+    assert json_dumps({1: 'a'}) == b'{"1": "a"}'
+
+
+def test_json_roundtrip():
+    assert json_loads(json_dumps({'columns': [{'column_name': 'ID'}]})) == {'columns': [{'column_name': 'ID'}]}
+
+
+def test_encode_body_gzips_only_large_bodies():
+    superset = make_superset(gzip_requests=True)
+
+    small_body = {'description': 'x' * (GZIP_MIN_BODY_SIZE // 2)}
+    data, content_encoding = superset._encode_body(small_body)
+    assert content_encoding is None
+    assert json_loads(data) == small_body
+
+    large_body = {'description': 'x' * GZIP_MIN_BODY_SIZE}
+    data, content_encoding = superset._encode_body(large_body)
+    assert content_encoding == 'gzip'
+    assert json_loads(gzip.decompress(data)) == large_body
+
+
+def test_encode_body_without_gzip_requests():
+    data, content_encoding = make_superset()._encode_body({'description': 'x' * GZIP_MIN_BODY_SIZE})
+    assert content_encoding is None
+
+
+def test_request_sends_json_as_data(monkeypatch):
+    monkeypatch.setattr(superset_api.requests, 'Session', FakeSession)
+    FakeSession.requests = []
+
+    body = {'description': 'x' * GZIP_MIN_BODY_SIZE}
+    assert make_superset(gzip_requests=True)._request('PUT', '/dataset/1', json=body) == {'id': 1}
+
+    session_headers, kwargs = FakeSession.requests[0]
+    assert 'Accept-Encoding' not in session_headers
+    assert 'json' not in kwargs
+    assert isinstance(kwargs['data'], bytes)
+    assert kwargs['headers']['Content-Encoding'] == 'gzip'
+    assert session_headers['Content-Type'] == 'application/json'
+    assert json_loads(gzip.decompress(kwargs['data'])) == body
+
+
+def test_login_uses_codec(monkeypatch):
+    sent = {}
+
+    def fake_request(method, url, **kwargs):
+        sent.update(kwargs)
+        return FakeResponse({'access_token': 'access', 'refresh_token': 'refresh'})
+
+    monkeypatch.setattr(superset_api.requests, 'request', fake_request)
+
+    superset = Superset('https://superset/api/v1', user='admin', password='secret')
+
+    assert 'json' not in sent
+    assert json_loads(sent['data'])['username'] == 'admin'
+    assert (superset.access_token, superset.refresh_token) == ('access', 'refresh')
+
+
+def test_refresh_token_uses_codec(monkeypatch):
+    class RefreshSession(FakeSession):
+        def request(self, method, url, **kwargs):
+            return FakeResponse({'access_token': 'fresh'})
+
+    monkeypatch.setattr(superset_api.requests, 'Session', RefreshSession)
+    superset = Superset('https://superset/api/v1', refresh_token='refresh')
+
+    superset._refresh_token()
+
+    assert superset.access_token == 'fresh'
+
+
+def test_log_response_compression(caplog):
+    caplog.set_level('INFO', logger=superset_api.__name__)
+    response = FakeResponse({'result': 'x' * 1000}, headers={'Content-Encoding': 'gzip', 'Content-Length': '100'})
+
+    Superset._log_response_compression(response)
+
+    assert f'gzip-compressed as 100 bytes instead of {len(response.content)}' in caplog.text